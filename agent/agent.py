@@ -1,16 +1,14 @@
+import atexit
 import logging
 import os
+import threading
 import uuid
 from typing import Annotated, Any, Generator, Optional, Sequence, TypedDict
 
 import mlflow
-from databricks_langchain import (
-    ChatDatabricks,
-    UCFunctionToolkit,
-    CheckpointSaver,
-)
+from databricks_langchain import ChatDatabricks, CheckpointSaver
 from langchain_core.messages import AIMessage, AIMessageChunk, AnyMessage
-from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt.tool_node import ToolNode
@@ -48,14 +46,30 @@ DATABRICKS_JOB_ID = get_databricks_job_id()
 UC_TOOL_NAMES: list[str] = []
 VECTOR_SEARCH_TOOLS = []
 
-tools: list = []
 
-if UC_TOOL_NAMES:
-    uc_toolkit = UCFunctionToolkit(function_names=UC_TOOL_NAMES)
-    tools.extend(uc_toolkit.tools)
+def _build_tools(job_id: str, uc_names: list[str]) -> list:
+    """Build the agent's tools.
+
+    UCFunctionToolkit is imported only when UC functions are configured, so
+    the job-tools-only agent does not pay its import cost.
+    """
+    built: list = []
+
+    if uc_names:
+        from databricks_langchain import UCFunctionToolkit
+
+        uc_toolkit = UCFunctionToolkit(function_names=uc_names)
+        built.extend(uc_toolkit.tools)
+
+    built.extend(VECTOR_SEARCH_TOOLS)
+    built.extend(create_job_tools(job_id))
+    return built
+
 
-tools.extend(VECTOR_SEARCH_TOOLS)
-tools.extend(create_job_tools(DATABRICKS_JOB_ID))
+tools: list = _build_tools(DATABRICKS_JOB_ID, UC_TOOL_NAMES)
+
+# Tools that end the graph run once called, returning control to the user
+_BREAKOUT_TOOL_NAMES: frozenset[str] = frozenset({"start_databricks_job"})
 
 #####################
 ## Define agent logic
@@ -74,9 +88,16 @@ class LangGraphResponsesAgent(ResponsesAgent):
         self.tools = tools
         self.model = ChatDatabricks(endpoint=LLM_ENDPOINT_NAME)
         self.system_prompt = SYSTEM_PROMPT
+        # Built once and prepended on every model call
+        self._sys_msg = ({"role": "system", "content": self.system_prompt},) if self.system_prompt else ()
         self.model_with_tools = self.model.bind_tools(self.tools) if self.tools else self.model
+        # Nodes and edges are request-independent; only compile() needs the checkpointer
+        self._workflow = self._build_workflow()
+        # Compiled lazily on first request against a long-lived checkpointer
+        self._graph = None
+        self._graph_lock = threading.Lock()
 
-    def _create_graph(self, checkpointer: Any):
+    def _build_workflow(self) -> StateGraph:
         def should_continue(state: AgentState):
             """Determine whether to continue tool execution or end the graph.
 
@@ -93,43 +114,38 @@ class LangGraphResponsesAgent(ResponsesAgent):
                 return "continue"
             return "end"
 
-        preprocessor = (
-            RunnableLambda(lambda state: [{"role": "system", "content": self.system_prompt}] + state["messages"])
-            if self.system_prompt
-            else RunnableLambda(lambda state: state["messages"])
-        )
-        model_runnable = preprocessor | self.model_with_tools
+        model = self.model_with_tools
+        sys_msg = self._sys_msg
 
+        # Prepend the system message inline rather than through a preprocessor
+        # Runnable, which added a sequence + lambda invoke layer per model call
         def call_model(state: AgentState, config: RunnableConfig):
-            response = model_runnable.invoke(state, config)
+            response = model.invoke([*sys_msg, *state["messages"]], config)
             return {"messages": [response]}
 
-        # Wrap ToolNode to detect when start_databricks_job is called
+        # Wrap ToolNode to detect when start_databricks_job is called.
+        # ToolNode already fans a turn's tool calls out over a thread pool, so
+        # the I/O-bound SDK calls overlap without a custom executor.
         tool_node = ToolNode(self.tools)
 
+        def detect_job_started(state: AgentState) -> bool:
+            """Check if a breakout tool was called in the AIMessage that routed here."""
+            # should_continue only routes to "tools" when the last message is an
+            # AIMessage with tool_calls, so there is no need to scan the history
+            last_ai = state["messages"][-1]
+            if not isinstance(last_ai, AIMessage):
+                return False
+            names = {tc.get("name") for tc in last_ai.tool_calls or ()}
+            return bool(names & _BREAKOUT_TOOL_NAMES)
+
         def call_tools(state: AgentState, config: RunnableConfig):
             """Execute tools and check if start_databricks_job was called."""
             result = tool_node.invoke(state, config)
-
-            # Check if start_databricks_job was called by examining the tool messages
-            job_started = False
-            messages = state.get("messages", [])
-
-            # Find the last AIMessage to check which tools were called
-            for msg in reversed(messages):
-                if isinstance(msg, AIMessage) and msg.tool_calls:
-                    for tool_call in msg.tool_calls:
-                        if tool_call.get("name") == "start_databricks_job":
-                            job_started = True
-                            break
-                    break
-
-            # Add job_started flag to the result
-            result["job_started"] = job_started
+            result["job_started"] = detect_job_started(state)
             return result
 
         workflow = StateGraph(AgentState)
-        workflow.add_node("agent", RunnableLambda(call_model))
+        workflow.add_node("agent", call_model)
 
         if self.tools:
             workflow.add_node("tools", call_tools)
@@ -139,7 +155,25 @@ class LangGraphResponsesAgent(ResponsesAgent):
             workflow.add_edge("agent", END)
 
         workflow.set_entry_point("agent")
-        return workflow.compile(checkpointer=checkpointer)
+        return workflow
+
+    def _get_graph(self):
+        """Return the compiled graph, opening the Lakebase checkpointer on first use.
+
+        The CheckpointSaver holds a connection pool, so it is entered once per
+        process and closed at interpreter exit rather than per request.
+        """
+        graph = self._graph
+        if graph is not None:
+            return graph
+
+        with self._graph_lock:
+            if self._graph is None:
+                checkpointer_cm = CheckpointSaver(instance_name=LAKEBASE_INSTANCE_NAME)
+                checkpointer = checkpointer_cm.__enter__()
+                atexit.register(checkpointer_cm.__exit__, None, None, None)
+                self._graph = self._workflow.compile(checkpointer=checkpointer)
+            return self._graph
 
     def _get_or_create_thread_id(self, request: ResponsesAgentRequest) -> str:
         """Get thread_id from request or create a new one.
@@ -152,7 +186,7 @@ class LangGraphResponsesAgent(ResponsesAgent):
         Returns:
             thread_id: The thread identifier to use for this conversation
         """
-        ci = dict(request.custom_inputs or {})
+        ci = request.custom_inputs or {}
 
         if "thread_id" in ci:
             return ci["thread_id"]
@@ -173,41 +207,66 @@ class LangGraphResponsesAgent(ResponsesAgent):
         ]
         return ResponsesAgentResponse(output=outputs, custom_outputs=request.custom_inputs)
 
-    def predict_stream(
+    def _prepare_input(
         self, request: ResponsesAgentRequest
-    ) -> Generator[ResponsesAgentStreamEvent, None, None]:
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Resolve the thread_id and build the graph input and checkpoint config."""
         thread_id = self._get_or_create_thread_id(request)
-        ci = dict(request.custom_inputs or {})
-        ci["thread_id"] = thread_id
-        request.custom_inputs = ci
+        if request.custom_inputs is None:
+            request.custom_inputs = {}
+        request.custom_inputs["thread_id"] = thread_id
 
         # Convert incoming Responses messages to ChatCompletions format
         # LangChain will automatically convert from ChatCompletions to LangChain format
-        cc_msgs = self.prep_msgs_for_cc_llm([i.model_dump() for i in request.input])
+        # exclude_none trims unused optional fields from long histories; exclude_unset
+        # is avoided because defaulted fields like `type` drive item conversion
+        cc_msgs = self.prep_msgs_for_cc_llm([i.model_dump(exclude_none=True) for i in request.input])
         langchain_msgs = cc_msgs
         checkpoint_config = {"configurable": {"thread_id": thread_id}}
+        return {"messages": langchain_msgs}, checkpoint_config
 
-        with CheckpointSaver(instance_name=LAKEBASE_INSTANCE_NAME) as checkpointer:
-            graph = self._create_graph(checkpointer)
-
-            for event in graph.stream(
-                {"messages": langchain_msgs},
-                checkpoint_config,
-                stream_mode=["updates", "messages"],
-            ):
-                if event[0] == "updates":
-                    for node_data in event[1].values():
-                        if len(node_data.get("messages", [])) > 0:
-                            yield from output_to_responses_items_stream(node_data["messages"])
-                elif event[0] == "messages":
-                    try:
-                        chunk = event[1][0]
-                        if isinstance(chunk, AIMessageChunk) and chunk.content:
-                            yield ResponsesAgentStreamEvent(
-                                **self.create_text_delta(delta=chunk.content, item_id=chunk.id),
-                            )
-                    except Exception as exc:
-                        logger.error("Error streaming chunk: %s", exc)
+    @staticmethod
+    def _text_delta_event(delta: str, item_id: str) -> ResponsesAgentStreamEvent:
+        """Build an output_text.delta event without the dict round-trip and validation.
+
+        Equivalent to ResponsesAgentStreamEvent(**create_text_delta(...)); the
+        fields come from our own model chunks, so model_construct is safe here.
+        """
+        return ResponsesAgentStreamEvent.model_construct(
+            type="response.output_text.delta",
+            item_id=item_id,
+            delta=delta,
+        )
+
+    def _to_stream_events(self, event: tuple) -> Generator[ResponsesAgentStreamEvent, None, None]:
+        """Translate one (stream_mode, payload) graph event into Responses stream events."""
+        if event[0] == "updates":
+            for node_data in event[1].values():
+                if len(node_data.get("messages", [])) > 0:
+                    yield from output_to_responses_items_stream(node_data["messages"])
+        elif event[0] == "messages":
+            chunk = event[1][0]
+            if not (isinstance(chunk, AIMessageChunk) and chunk.content):
+                return
+            # _text_delta_event skips validation, so reject what validation
+            # used to: a delta event needs the id of the item it belongs to
+            if not chunk.id:
+                logger.error("Error streaming chunk: missing message id")
+                return
+            yield self._text_delta_event(chunk.content, chunk.id)
+
+    def predict_stream(
+        self, request: ResponsesAgentRequest
+    ) -> Generator[ResponsesAgentStreamEvent, None, None]:
+        graph_input, checkpoint_config = self._prepare_input(request)
+        graph = self._get_graph()
+
+        for event in graph.stream(
+            graph_input,
+            checkpoint_config,
+            stream_mode=["updates", "messages"],
+        ):
+            yield from self._to_stream_events(event)
 
 
 # ----- Export model -----
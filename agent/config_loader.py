@@ -5,29 +5,82 @@ This module provides a single source of truth for loading configuration
 from agent/config.yaml.
 """
 
-from functools import lru_cache
+import hashlib
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 CONFIG_PATH = Path(__file__).parent / "config.yaml"
 
+# Build artifact from scripts/compile_config.py. It is only used while it
+# matches config.yaml (by SHA-256 of the source), so a stale compile never
+# shadows edits to the YAML file.
+try:
+    from agent._config_compiled import CONFIG as _COMPILED_CONFIG
+    from agent._config_compiled import SOURCE_SHA256 as _COMPILED_SOURCE_SHA256
+except ImportError:
+    _COMPILED_CONFIG = None
+    _COMPILED_SOURCE_SHA256 = None
+
+# Parsed config keyed by (st_mtime_ns, st_size, st_ino) of CONFIG_PATH so
+# edits and atomic replacements are picked up without a manual cache reset.
+_CACHE: dict[tuple[int, int, int], dict[str, Any]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _read_config_cached(key: tuple[int, int, int]) -> dict[str, Any]:
+    """
+    Return the parsed config for the given file stat key, parsing on a miss.
+
+    The returned dict is shared across callers and must be treated as read-only.
+    """
+    with _CACHE_LOCK:
+        config = _CACHE.get(key)
+        if config is None:
+            data = CONFIG_PATH.read_bytes()
+            if (
+                _COMPILED_CONFIG is not None
+                and hashlib.sha256(data).hexdigest() == _COMPILED_SOURCE_SHA256
+            ):
+                config = _COMPILED_CONFIG
+            else:
+                config = yaml.load(data, Loader=_YamlLoader)
+            _CACHE.clear()
+            _CACHE[key] = config
+        return config
+
 
-@lru_cache(maxsize=1)
 def load_config() -> dict[str, Any]:
     """
     Load configuration from agent/config.yaml.
 
+    The result is cached and only re-read when the file's mtime, size, or
+    inode changes. If agent/_config_compiled.py was generated from the
+    current contents of config.yaml it is used instead of parsing the YAML;
+    it is also used when config.yaml is missing.
+
     Returns:
         Configuration dictionary with all settings.
 
     Raises:
-        FileNotFoundError: If config.yaml doesn't exist.
+        FileNotFoundError: If config.yaml doesn't exist and there is no compiled config.
         yaml.YAMLError: If config.yaml is invalid.
     """
-    with open(CONFIG_PATH) as f:
-        return yaml.safe_load(f)
+    try:
+        st = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        if _COMPILED_CONFIG is not None:
+            return _COMPILED_CONFIG
+        raise
+    return _read_config_cached((st.st_mtime_ns, st.st_size, st.st_ino))
 
 
 def get_mlflow_experiment_id() -> str:
@@ -7,6 +7,7 @@ from .job_tools import (
     create_start_job_tool,
     poll_databricks_job,
     terminate_databricks_job,
+    wait_databricks_job,
 )
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "create_start_job_tool",
     "poll_databricks_job",
     "terminate_databricks_job",
+    "wait_databricks_job",
 ]
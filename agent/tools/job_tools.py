@@ -4,10 +4,14 @@ Databricks job management tools for the LangGraph agent.
 These tools allow the agent to:
 1. Start a Databricks job with a user request
 2. Poll job status
-3. Terminate a running job
+3. Wait for a job to finish
+4. Terminate a running job
 """
 
 import logging
+import random
+import time
+import uuid
 from typing import Any, Optional
 
 from databricks.sdk.service.jobs import RunLifeCycleState, RunResultState
@@ -18,6 +22,38 @@ from agent.utils import get_workspace_client, error_response, success_response
 
 logger = logging.getLogger(__name__)
 
+# Run states terminate_databricks_job will cancel
+_CANCELLABLE_STATES = frozenset({
+    RunLifeCycleState.PENDING,
+    RunLifeCycleState.RUNNING,
+})
+
+# Run states after which a run will not change again; QUEUED, BLOCKED and
+# WAITING_FOR_RETRY are transient, so waiting keys off these instead of is_running
+_TERMINAL_STATE_VALUES = frozenset({
+    RunLifeCycleState.TERMINATED.value,
+    RunLifeCycleState.SKIPPED.value,
+    RunLifeCycleState.INTERNAL_ERROR.value,
+})
+
+# wait_databricks_job runs inside a Model Serving request, so its timeout is
+# capped well below the serving request timeout. The limit leaves room for
+# one more get_run, which may itself retry for up to the client's
+# retry_timeout_seconds. Polling intervals are fixed here rather than
+# exposed to the model.
+_WAIT_DEFAULT_TIMEOUT_SECONDS = 120.0
+_WAIT_MAX_TIMEOUT_SECONDS = 180.0
+_WAIT_MIN_INTERVAL_SECONDS = 2.0
+_WAIT_MAX_INTERVAL_SECONDS = 30.0
+_WAIT_INTERVAL_GROWTH = 1.5
+
+# Run states reported as is_running by the poll/wait tools
+_RUNNING_STATES = frozenset({
+    RunLifeCycleState.PENDING,
+    RunLifeCycleState.RUNNING,
+    RunLifeCycleState.TERMINATING,
+})
+
 
 class StartJobInput(BaseModel):
     """Input schema for start_databricks_job tool."""
@@ -65,9 +101,12 @@ def create_start_job_tool(job_id: str) -> StructuredTool:
 
         try:
             logger.info("Starting Databricks job %s", job_id)
+            # The idempotency token makes the SDK's own retries safe: a request
+            # that reached the server before a timeout cannot start a second run
             run = client.jobs.run_now(
                 job_id=int(job_id),
                 job_parameters=params,
+                idempotency_token=str(uuid.uuid4()),
             )
             logger.info("Job %s started with run_id %s", job_id, run.run_id)
 
@@ -92,6 +131,56 @@ def create_start_job_tool(job_id: str) -> StructuredTool:
     )
 
 
+def _build_status_response(run: Any, run_id: str) -> dict[str, Any]:
+    """Build the poll/wait tool response from a jobs.get_run result."""
+    state = run.state
+    life_cycle_state = state.life_cycle_state if state else None
+    result_state = state.result_state if state else None
+    state_message = state.state_message if state else None
+
+    # Determine if the job is still running
+    is_running = life_cycle_state in _RUNNING_STATES
+
+    # Build response
+    response: dict[str, Any] = {
+        "success": True,
+        "run_id": run_id,
+        "life_cycle_state": life_cycle_state.value if life_cycle_state else None,
+        "is_running": is_running,
+        "state_message": state_message,
+    }
+
+    # Add result info if completed
+    if result_state:
+        response["result_state"] = result_state.value
+        response["is_successful"] = result_state == RunResultState.SUCCESS
+
+    # Add run page URL if available
+    run_page_url = run.run_page_url
+    if run_page_url:
+        response["run_page_url"] = run_page_url
+
+    # Add task outputs if available and job is complete
+    tasks = run.tasks
+    if not is_running and tasks:
+        task_results = []
+        append = task_results.append
+        for task in tasks:
+            task_state = task.state
+            task_lcs = task_state.life_cycle_state if task_state else None
+            task_info: dict[str, Any] = {
+                "task_key": task.task_key,
+                "state": task_lcs.value if task_lcs else None,
+            }
+            task_result = task_state.result_state if task_state else None
+            if task_result:
+                task_info["result"] = task_result.value
+            append(task_info)
+        response["tasks"] = task_results
+
+    return response
+
+
 @tool
 def poll_databricks_job(run_id: str) -> dict[str, Any]:
     """
@@ -111,50 +200,9 @@ def poll_databricks_job(run_id: str) -> dict[str, Any]:
         logger.info("Polling status for run_id %s", run_id)
         run = client.jobs.get_run(run_id=int(run_id))
 
-        state = run.state
-        life_cycle_state = state.life_cycle_state if state else None
-        result_state = state.result_state if state else None
-        state_message = state.state_message if state else None
-
-        # Determine if the job is still running
-        is_running = life_cycle_state in [
-            RunLifeCycleState.PENDING,
-            RunLifeCycleState.RUNNING,
-            RunLifeCycleState.TERMINATING,
-        ]
-
-        # Build response
-        response: dict[str, Any] = {
-            "success": True,
-            "run_id": run_id,
-            "life_cycle_state": life_cycle_state.value if life_cycle_state else None,
-            "is_running": is_running,
-            "state_message": state_message,
-        }
-
-        # Add result info if completed
-        if result_state:
-            response["result_state"] = result_state.value
-            response["is_successful"] = result_state == RunResultState.SUCCESS
-
-        # Add run page URL if available
-        if run.run_page_url:
-            response["run_page_url"] = run.run_page_url
-
-        # Add task outputs if available and job is complete
-        if not is_running and run.tasks:
-            task_results = []
-            for task in run.tasks:
-                task_info: dict[str, Any] = {
-                    "task_key": task.task_key,
-                    "state": task.state.life_cycle_state.value if task.state else None,
-                }
-                if task.state and task.state.result_state:
-                    task_info["result"] = task.state.result_state.value
-                task_results.append(task_info)
-            response["tasks"] = task_results
-
-        logger.info("Run %s status: %s", run_id, life_cycle_state)
+        response = _build_status_response(run, run_id)
+
+        logger.info("Run %s status: %s", run_id, response["life_cycle_state"])
         return response
 
     except Exception as e:
@@ -165,6 +213,73 @@ def poll_databricks_job(run_id: str) -> dict[str, Any]:
         )
 
 
+@tool
+def wait_databricks_job(
+    run_id: str,
+    timeout_seconds: float = _WAIT_DEFAULT_TIMEOUT_SECONDS,
+) -> dict[str, Any]:
+    """
+    Wait for a Databricks job run to finish, polling with adaptive backoff.
+
+    Use this tool instead of repeatedly calling poll_databricks_job when the user
+    explicitly asks to wait for a job to complete.
+
+    Args:
+        run_id: The run ID returned when the job was started.
+        timeout_seconds: Maximum time to wait before returning the latest status
+            (at most 180 seconds).
+
+    Returns:
+        The final status (same shape as poll_databricks_job), with timed_out=True
+        if the run was still in progress when the timeout elapsed.
+    """
+    client = get_workspace_client()
+    timeout_seconds = float(timeout_seconds)
+    if not timeout_seconds >= 0.0:  # negative or NaN
+        timeout_seconds = 0.0
+    timeout_seconds = min(timeout_seconds, _WAIT_MAX_TIMEOUT_SECONDS)
+
+    try:
+        logger.info("Waiting up to %ss for run_id %s", timeout_seconds, run_id)
+        deadline = time.monotonic() + timeout_seconds
+        idx = 0
+        last_state = None
+
+        while True:
+            response = _build_status_response(client.jobs.get_run(run_id=int(run_id)), run_id)
+            if response["life_cycle_state"] in _TERMINAL_STATE_VALUES:
+                logger.info("Run %s finished: %s", run_id, response["life_cycle_state"])
+                return response
+
+            # Back off while nothing changes; check quickly again after a transition
+            if response["life_cycle_state"] != last_state:
+                last_state = response["life_cycle_state"]
+                idx = 0
+            else:
+                idx += 1
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                response["timed_out"] = True
+                response["message"] = (
+                    f"Job run {run_id} is still {last_state} after {timeout_seconds:g}s."
+                )
+                return response
+
+            upper = min(
+                _WAIT_MAX_INTERVAL_SECONDS,
+                _WAIT_MIN_INTERVAL_SECONDS * _WAIT_INTERVAL_GROWTH ** idx,
+            )
+            time.sleep(min(remaining, random.uniform(_WAIT_MIN_INTERVAL_SECONDS, upper)))
+
+    except Exception as e:
+        return error_response(
+            operation="wait for",
+            error=e,
+            identifier=f"run {run_id}",
+        )
+
+
 @tool
 def terminate_databricks_job(run_id: str) -> dict[str, Any]:
     """
@@ -183,15 +298,13 @@ def terminate_databricks_job(run_id: str) -> dict[str, Any]:
     try:
         logger.info("Attempting to terminate run_id %s", run_id)
 
-        # First check if the job is actually running
+        # Check the state first: cancel_run on a run that already finished is
+        # accepted as a no-op, so it can't tell us whether anything was cancelled
         run = client.jobs.get_run(run_id=int(run_id))
         state = run.state
         life_cycle_state = state.life_cycle_state if state else None
 
-        if life_cycle_state not in [
-            RunLifeCycleState.PENDING,
-            RunLifeCycleState.RUNNING,
-        ]:
+        if life_cycle_state not in _CANCELLABLE_STATES:
             logger.warning(
                 "Run %s is not in a cancellable state: %s",
                 run_id,
@@ -235,5 +348,6 @@ def create_job_tools(job_id: str) -> list[StructuredTool]:
     return [
         create_start_job_tool(job_id),
         poll_databricks_job,
+        wait_databricks_job,
         terminate_databricks_job,
     ]
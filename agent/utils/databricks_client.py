@@ -5,27 +5,57 @@ Provides a singleton WorkspaceClient instance to avoid redundant
 client creation across tool modules.
 """
 
+from __future__ import annotations
+
 import logging
-from functools import lru_cache
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
 
-from databricks.sdk import WorkspaceClient
+if TYPE_CHECKING:
+    from databricks.sdk import WorkspaceClient
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the SDK's built-in retries of 429/503 and connection errors
+# (default 300s), so a single tool call cannot hang for minutes
+_RETRY_TIMEOUT_SECONDS = 60
+
+_client: Optional[WorkspaceClient] = None
+_client_lock = threading.Lock()
+
 
-@lru_cache(maxsize=1)
 def get_workspace_client() -> WorkspaceClient:
     """
     Get or create a cached Databricks WorkspaceClient.
 
-    Uses lru_cache to ensure only one client instance is created
-    and reused across all tool calls.
+    Uses double-checked locking so the common path is a single global
+    read, while concurrent first calls still create only one client.
 
     Returns:
         WorkspaceClient: A configured Databricks workspace client.
     """
-    logger.debug("Creating Databricks WorkspaceClient")
-    return WorkspaceClient()
+    global _client
+    client = _client
+    if client is not None:
+        return client
+
+    with _client_lock:
+        if _client is None:
+            # Imported here so importing agent.utils does not load the SDK
+            from databricks.sdk import WorkspaceClient
+            from databricks.sdk.core import Config
+
+            logger.debug("Creating Databricks WorkspaceClient")
+            # With explicit host/token the SDK skips probing its other auth providers
+            host = os.environ.get("DATABRICKS_HOST")
+            token = os.environ.get("DATABRICKS_TOKEN")
+            if host and token:
+                config = Config(host=host, token=token, retry_timeout_seconds=_RETRY_TIMEOUT_SECONDS)
+            else:
+                config = Config(retry_timeout_seconds=_RETRY_TIMEOUT_SECONDS)
+            _client = WorkspaceClient(config=config)
+        return _client
 
 
 def reset_client() -> None:
@@ -34,5 +64,18 @@ def reset_client() -> None:
 
     Useful for testing or when credentials need to be refreshed.
     """
-    get_workspace_client.cache_clear()
+    global _client
+    with _client_lock:
+        _client = None
     logger.debug("Databricks WorkspaceClient cache cleared")
+
+
+def _reset_after_fork() -> None:
+    """Drop the parent's client in forked workers; its HTTP session is not fork-safe."""
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -12,6 +12,7 @@ REQUIRED_DATABRICKS_ENV_VARS = [
     "DATABRICKS_HOST",
     "DATABRICKS_TOKEN",
 ]
+_REQUIRED_DATABRICKS_ENV_SET = frozenset(REQUIRED_DATABRICKS_ENV_VARS)
 
 
 def check_databricks_environment(verbose: bool = True) -> bool:
@@ -24,7 +25,10 @@ def check_databricks_environment(verbose: bool = True) -> bool:
     Returns:
         True if all required variables are set, False otherwise.
     """
-    missing = [var for var in REQUIRED_DATABRICKS_ENV_VARS if not os.getenv(var)]
+    # KeysView & set only probes the required names; empty values count as missing
+    environ = os.environ
+    present = {var for var in environ.keys() & _REQUIRED_DATABRICKS_ENV_SET if environ[var]}
+    missing = sorted(_REQUIRED_DATABRICKS_ENV_SET - present)
 
     if missing and verbose:
         print("Missing required environment variables:")
@@ -2,11 +2,10 @@
 MLflow utilities for experiment tracking and model logging.
 
 This module provides shared functions for setting up MLflow tracking
-with Databricks.
+with Databricks. mlflow is imported inside each function so that importing
+agent.utils (e.g. for the environment check) does not pay its import cost.
 """
 
-import mlflow
-
 
 def setup_mlflow_tracking(experiment_id: str) -> None:
     """
@@ -15,10 +14,14 @@ def setup_mlflow_tracking(experiment_id: str) -> None:
     Args:
         experiment_id: The MLflow experiment ID to use.
     """
+    import mlflow
+
     mlflow.set_tracking_uri("databricks")
     mlflow.set_experiment(experiment_id=experiment_id)
 
 
 def setup_mlflow_registry() -> None:
     """Configure MLflow to use Unity Catalog as model registry."""
+    import mlflow
+
     mlflow.set_registry_uri("databricks-uc")
@@ -86,8 +86,15 @@ def error_response(
     else:
         message = f"Failed to {operation}: {error_str}"
 
-    if log_error:
-        logger.error(message, exc_info=True)
+    # Guard explicitly so traceback capture is skipped when ERROR is filtered out
+    if log_error and logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            "Failed to %s%s: %s",
+            operation,
+            f" for {identifier}" if identifier else "",
+            error_str,
+            exc_info=True,
+        )
 
     return {
         "success": False,
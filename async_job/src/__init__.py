@@ -5,12 +5,30 @@ This package contains task implementations and shared utilities
 for the async_job Databricks Asset Bundle.
 """
 
-from .lakebase_utils import get_lakebase_connection, log_to_lakebase
-from .schema import TASK_LOGS_SCHEMA, ensure_task_logs_table_exists
+from .lakebase_utils import (
+    MAX_LOG_CHARS,
+    AsyncLakebaseLogger,
+    borrow_conn,
+    clip_log_message,
+    get_lakebase_connection,
+    log_to_lakebase,
+)
+from .schema import (
+    TASK_LOGS_INDEXES,
+    TASK_LOGS_MIGRATIONS,
+    TASK_LOGS_SCHEMA,
+    ensure_task_logs_table_exists,
+)
 
 __all__ = [
+    "MAX_LOG_CHARS",
+    "AsyncLakebaseLogger",
+    "borrow_conn",
+    "clip_log_message",
     "get_lakebase_connection",
     "log_to_lakebase",
+    "TASK_LOGS_INDEXES",
+    "TASK_LOGS_MIGRATIONS",
     "TASK_LOGS_SCHEMA",
     "ensure_task_logs_table_exists",
 ]
@@ -13,7 +13,7 @@ import json
 import logging
 import os
 import sys
-from typing import Annotated, Any, Sequence, TypedDict
+from typing import Annotated, Any, Optional, Sequence, TypedDict
 
 logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
@@ -39,7 +39,41 @@ from langgraph.graph.message import add_messages  # noqa: E402
 from langgraph.prebuilt.tool_node import ToolNode  # noqa: E402
 
 from genie_tools import create_genie_tool  # noqa: E402
-from lakebase_utils import log_to_lakebase  # noqa: E402
+from lakebase_utils import AsyncLakebaseLogger, clip_log_message  # noqa: E402
+
+_JSON_SCALARS = (str, float, bool, type(None))
+# orjson only serializes 64-bit integers; anything wider is stringified
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def _safe(value: Any) -> Any:
+    """Convert a value to JSON-native types, stringifying anything else."""
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    if isinstance(value, int):
+        return value if _INT64_MIN <= value <= _INT64_MAX else str(value)
+    if isinstance(value, dict):
+        return {str(k): _safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_safe(v) for v in value]
+    return str(value)
+
+
+# orjson is several times faster than json for the small per-step payloads;
+# fall back to the stdlib when it isn't installed. Payloads go through _safe
+# first, so neither needs a default= hook.
+try:
+    import orjson  # noqa: E402
+
+    def _dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # Never let a step log abort the workflow over an unsupported value
+            return json.dumps(obj, default=str)
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
 
 # ---------------------------------------------------------------------------
 # Configuration — passed via CLI args or hardcoded defaults
@@ -51,6 +85,9 @@ GENIE_DESCRIPTION = os.getenv(
     "Query customer transaction data using natural language.",
 )
 
+# How long the task waits at exit for queued step logs to reach Lakebase
+LOG_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("LOG_SHUTDOWN_TIMEOUT_SECONDS", "120"))
+
 SYSTEM_PROMPT = """\
 You are a data analyst assistant. Use the query_genie tool to answer the user's question.
 
@@ -73,9 +110,9 @@ def build_graph(tools: list, llm_endpoint: str, system_prompt: str):
     model = ChatDatabricks(endpoint=llm_endpoint)
     model_with_tools = model.bind_tools(tools) if tools else model
 
-    preprocessor = RunnableLambda(
-        lambda state: [{"role": "system", "content": system_prompt}] + list(state["messages"])
-    )
+    # Built once per graph; LangChain converts the dict without mutating it
+    system_msg = {"role": "system", "content": system_prompt}
+    preprocessor = RunnableLambda(lambda state: [system_msg, *state["messages"]])
     model_runnable = preprocessor | model_with_tools
 
     def call_model(state: AgentState, config: RunnableConfig):
@@ -100,6 +137,91 @@ def build_graph(tools: list, llm_endpoint: str, system_prompt: str):
     return graph.compile()
 
 
+# ---------------------------------------------------------------------------
+# Step logging
+# ---------------------------------------------------------------------------
+class _StreamState:
+    """Mutable state shared by the message handlers while streaming the graph."""
+
+    __slots__ = ("lakebase_logger", "step_number", "result_text", "pending")
+
+    def __init__(self, lakebase_logger: AsyncLakebaseLogger):
+        self.lakebase_logger = lakebase_logger
+        self.step_number = 0
+        self.result_text = ""
+        # tool_call_id -> tool_call payload, waiting for the matching result
+        self.pending: dict[str, dict[str, Any]] = {}
+
+    def flush_pending(self) -> None:
+        """Log tool calls that never got a result (e.g. the run failed mid-tool)."""
+        for tool_call_id, payload in self.pending.items():
+            _log_step(self, payload, "tool_call", tool_call_id)
+        self.pending.clear()
+
+
+def _log_step(
+    state: _StreamState,
+    payload: dict[str, Any],
+    status: str,
+    tool_call_id: Optional[str] = None,
+) -> None:
+    """Queue one step-log row."""
+    state.lakebase_logger.log(
+        task_name="agent_workflow_task",
+        message=_dumps(payload),
+        status=status,
+        tool_call_id=tool_call_id,
+    )
+
+
+def _handle_ai_message(msg: Any, state: _StreamState) -> None:
+    """Record each tool call from the LLM, or collect the final text response."""
+    if msg.tool_calls:
+        for tc in msg.tool_calls:
+            state.step_number += 1
+            payload = {
+                "step": state.step_number,
+                "tool": tc.get("name", "unknown"),
+                "arguments": _safe(tc.get("args", {})),
+            }
+            tool_call_id = tc.get("id")
+            if tool_call_id:
+                # Logged together with its result as a single row
+                state.pending[tool_call_id] = payload
+            else:
+                _log_step(state, payload, "tool_call")
+            logger.info("Step %d — tool_call: %s", state.step_number, tc.get("name"))
+
+    elif msg.content:
+        state.result_text += msg.content
+
+
+def _handle_tool_message(msg: Any, state: _StreamState) -> None:
+    """Log a tool result, merged with its tool call when one is pending."""
+    output = msg.content if hasattr(msg, "content") else str(msg)
+    tool_call_id = str(getattr(msg, "tool_call_id", "") or "") or None
+    payload = state.pending.pop(tool_call_id, None) if tool_call_id else None
+    if payload is None:
+        state.step_number += 1
+        payload = {"step": state.step_number}
+    payload["tool_call_id"] = tool_call_id or ""
+    # Clip the field rather than the JSON so the row stays valid JSON
+    payload["output"] = clip_log_message(output) if isinstance(output, str) else _safe(output)
+    _log_step(state, payload, "tool_result", tool_call_id)
+    logger.info("Step %d — tool_result: %s", payload["step"], str(msg.content)[:200])
+
+
+def _ignore_message(msg: Any, state: _StreamState) -> None:
+    pass
+
+
+# Dispatch on LangChain's message.type instead of an isinstance chain
+_MESSAGE_HANDLERS = {
+    "ai": _handle_ai_message,
+    "tool": _handle_tool_message,
+}
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -138,62 +260,44 @@ def main():
     )]
     graph = build_graph(tools, LLM_ENDPOINT_NAME, SYSTEM_PROMPT)
 
-    # Stream through the graph and log intermediate steps
-    step_number = 0
-    result_text = ""
-
-    for event in graph.stream(
-        {"messages": [{"role": "user", "content": user_request}]},
-        stream_mode="updates",
-    ):
-        for node_name, node_data in event.items():
-            for msg in node_data.get("messages", []):
-                # Tool calls from the LLM
-                if isinstance(msg, AIMessage) and msg.tool_calls:
-                    for tc in msg.tool_calls:
-                        step_number += 1
-                        log_to_lakebase(
-                            instance_name=lakebase_instance,
-                            task_name="agent_workflow_task",
-                            message=json.dumps({
-                                "step": step_number,
-                                "tool": tc.get("name", "unknown"),
-                                "arguments": tc.get("args", {}),
-                            }, default=str),
-                            status="tool_call",
-                        )
-                        logger.info("Step %d — tool_call: %s", step_number, tc.get("name"))
-
-                # Tool results
-                elif hasattr(msg, "type") and msg.type == "tool":
-                    step_number += 1
-                    log_to_lakebase(
-                        instance_name=lakebase_instance,
-                        task_name="agent_workflow_task",
-                        message=json.dumps({
-                            "step": step_number,
-                            "tool_call_id": getattr(msg, "tool_call_id", ""),
-                            "output": msg.content if hasattr(msg, "content") else str(msg),
-                        }, default=str),
-                        status="tool_result",
-                    )
-                    logger.info("Step %d — tool_result: %s", step_number, str(msg.content)[:200])
-
-                # Final text response
-                elif isinstance(msg, AIMessage) and not msg.tool_calls and msg.content:
-                    result_text += msg.content
-
-    if not result_text:
-        result_text = "(no text output)"
-
-    logger.info("Agent response: %s", result_text[:500])
-
-    # Log final result
-    log_to_lakebase(
-        instance_name=lakebase_instance,
-        task_name="agent_workflow_task",
-        message=result_text,
-    )
+    # Stream through the graph and log intermediate steps. Rows are written
+    # in batches on a background thread so the loop never waits on Lakebase.
+    lakebase_logger = AsyncLakebaseLogger(lakebase_instance)
+    stream_state = _StreamState(lakebase_logger)
+
+    # Local aliases keep global lookups out of the per-message loop
+    get_handler = _MESSAGE_HANDLERS.get
+    noop = _ignore_message
+
+    try:
+        for event in graph.stream(
+            {"messages": [{"role": "user", "content": user_request}]},
+            stream_mode="updates",
+        ):
+            for node_data in event.values():
+                for msg in node_data.get("messages", []):
+                    get_handler(getattr(msg, "type", ""), noop)(msg, stream_state)
+
+        result_text = stream_state.result_text
+        if not result_text:
+            result_text = "(no text output)"
+
+        logger.info("Agent response: %s", result_text[:500])
+
+        # Log final result
+        lakebase_logger.log(
+            task_name="agent_workflow_task",
+            message=result_text,
+        )
+    finally:
+        # Persist everything collected, including partial progress on failure
+        stream_state.flush_pending()
+        try:
+            lakebase_logger.shutdown(timeout=LOG_SHUTDOWN_TIMEOUT_SECONDS)
+        except Exception:
+            # Logged rather than raised so a failure here can't mask an
+            # exception already propagating from the graph
+            logger.exception("Failed to write some step logs to Lakebase")
 
     print("Agent workflow task completed successfully!")
 
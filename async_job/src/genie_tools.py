@@ -14,6 +14,10 @@ from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Cap on the Genie result handed back to the model (characters); larger
+# result sets are truncated so they don't flood the model's context
+MAX_GENIE_CHARS = 256 * 1024
+
 
 class GenieQueryInput(BaseModel):
     """Input schema for the Genie query tool."""
@@ -24,6 +28,7 @@ def create_genie_tool(
     space_id: str,
     agent_name: str = "Genie",
     description: Optional[str] = None,
+    max_chars: int = MAX_GENIE_CHARS,
 ) -> StructuredTool:
     """
     Create a Genie tool that can query structured data using natural language.
@@ -32,6 +37,8 @@ def create_genie_tool(
         space_id: The Databricks Genie space ID.
         agent_name: Name for the Genie agent (default: "Genie").
         description: Description of what this Genie space can answer.
+        max_chars: Maximum number of characters of the result to return;
+            anything beyond it is truncated (default: MAX_GENIE_CHARS).
 
     Returns:
         A StructuredTool configured to query the Genie space.
@@ -58,6 +65,12 @@ def create_genie_tool(
             else:
                 result = str(response)
 
+            if isinstance(result, str) and len(result) > max_chars:
+                logger.warning(
+                    "Genie result is %d chars; truncating to %d", len(result), max_chars
+                )
+                result = f"{result[:max_chars]}...[truncated {len(result) - max_chars} chars]"
+
             logger.info("Genie query completed successfully")
             return result
 
@@ -5,17 +5,71 @@ This module provides shared functions for connecting to and
 logging data to Databricks Lakebase.
 """
 
+import atexit
+import functools
+import os
+import queue
+import random
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional
 
 import psycopg2
+from psycopg2.extras import execute_batch
+from psycopg2.pool import ThreadedConnectionPool
 from databricks.sdk import WorkspaceClient
+from databricks.sdk.core import Config
 
 try:
     from .schema import ensure_task_logs_table_exists
 except ImportError:
     from schema import ensure_task_logs_table_exists
 
+# Lakebase credentials are short-lived (about an hour); rebuild a pool this
+# long before its credential expires so new connections never use a stale token.
+_CREDENTIAL_REFRESH_MARGIN = timedelta(seconds=60)
+_DEFAULT_CREDENTIAL_TTL = timedelta(hours=1)
+
+# Cap on logged payload size (characters); large tool outputs such as Genie
+# result tables are truncated before being sent to Postgres
+MAX_LOG_CHARS = 8192
+
+# Upper bound on the SDK's built-in retries of control-plane calls (default
+# 300s), so a credential or instance lookup can't stall logging for minutes
+_SDK_RETRY_TIMEOUT_SECONDS = 60
+
+# SQLSTATEs for a rejected credential (invalid_password,
+# invalid_authorization_specification)
+_AUTH_ERROR_CODES = frozenset({"28P01", "28000"})
+
+# Per-instance pool bounds; logging rarely needs more than one connection at a time
+_POOL_MIN_CONN = 1
+_POOL_MAX_CONN = 4
+
+# instance_name -> (connection pool, credential expiry) used by log_to_lakebase
+_POOLS: dict[str, tuple[ThreadedConnectionPool, datetime]] = {}
+# Instances whose task_logs table has been created by this process
+_TABLE_READY: set[str] = set()
+_POOLS_LOCK = threading.Lock()
+
+# instance_name -> (credential token, expiry), shared by pools and standalone connections
+_CRED_CACHE: dict[str, tuple[str, datetime]] = {}
+_CRED_LOCK = threading.Lock()
+
+# Server-side prepared INSERT, created once per connection so Postgres parses
+# and plans it once instead of on every log row
+_INSERT_STATEMENT_SQL = """
+PREPARE task_log_ins (varchar, text, timestamptz, varchar, varchar) AS
+INSERT INTO task_logs (task_name, message, timestamp, status, tool_call_id)
+VALUES ($1, $2, $3, $4, $5)
+"""
+_PREPARED_CONNS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
 
 def get_lakebase_connection(instance_name: str):
     """
@@ -35,50 +89,240 @@ def get_lakebase_connection(instance_name: str):
         finally:
             conn.close()
     """
-    w = WorkspaceClient()
+    params, _ = _connection_params(instance_name)
+    try:
+        return psycopg2.connect(**params)
+    except psycopg2.OperationalError as e:
+        if not _is_auth_error(e):
+            raise
+        # The cached credential was rejected (e.g. revoked); retry once with a fresh one
+        _invalidate_token(instance_name)
+        params, _ = _connection_params(instance_name)
+        return psycopg2.connect(**params)
+
+
+def _is_auth_error(exc: Exception) -> bool:
+    """True if a psycopg2 error is the server rejecting the credential."""
+    if getattr(exc, "pgcode", None) in _AUTH_ERROR_CODES:
+        return True
+    # Connection-time failures carry no SQLSTATE, only the server's message
+    return "password authentication failed" in str(exc)
+
+
+def _parse_expiration(expiration_time: str | None) -> datetime:
+    """
+    Parse the SDK's ISO-8601 credential expiry, defaulting to a one-hour TTL.
+
+    Falls back to the default when the value is missing, has no timezone,
+    or can't be parsed (e.g. more than six fractional digits on Python 3.10),
+    so an unexpected format never breaks connecting.
+    """
+    if expiration_time:
+        try:
+            expires_at = datetime.fromisoformat(expiration_time.replace("Z", "+00:00"))
+        except (AttributeError, TypeError, ValueError):
+            expires_at = None
+        if expires_at is not None and expires_at.tzinfo is not None:
+            return expires_at
+    return datetime.now(timezone.utc) + _DEFAULT_CREDENTIAL_TTL
+
+
+@functools.lru_cache(maxsize=1)
+def _get_workspace_client() -> WorkspaceClient:
+    """Process-wide WorkspaceClient, so auth is resolved once rather than per lookup."""
+    # With explicit host/token the SDK skips probing its other auth providers
+    host = os.environ.get("DATABRICKS_HOST")
+    token = os.environ.get("DATABRICKS_TOKEN")
+    if host and token:
+        config = Config(host=host, token=token, retry_timeout_seconds=_SDK_RETRY_TIMEOUT_SECONDS)
+    else:
+        config = Config(retry_timeout_seconds=_SDK_RETRY_TIMEOUT_SECONDS)
+    return WorkspaceClient(config=config)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_username() -> str:
+    """Current user's name; stable for the lifetime of the process."""
+    return _get_workspace_client().current_user.me().user_name
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_instance(instance_name: str):
+    """Lakebase instance details (e.g. read_write_dns), which are effectively static."""
+    return _get_workspace_client().database.get_database_instance(name=instance_name)
+
+
+def _get_token(instance_name: str) -> tuple[str, datetime]:
+    """
+    Return a (token, expiry) credential for an instance, minting only when needed.
 
-    # Get instance details
-    instance = w.database.get_database_instance(name=instance_name)
+    The cached credential is reused until it is within the refresh margin
+    of its expiry, so a long-lived process mints about once an hour.
+    """
+    with _CRED_LOCK:
+        cached = _CRED_CACHE.get(instance_name)
+        if cached is not None and cached[1] - datetime.now(timezone.utc) > _CREDENTIAL_REFRESH_MARGIN:
+            return cached
 
-    # Generate credentials
-    cred = w.database.generate_database_credential(
+    cred = _get_workspace_client().database.generate_database_credential(
         request_id=str(uuid.uuid4()),
-        instance_names=[instance_name]
+        instance_names=[instance_name],
     )
+    token = (cred.token, _parse_expiration(cred.expiration_time))
+    with _CRED_LOCK:
+        _CRED_CACHE[instance_name] = token
+    return token
+
+
+def _invalidate_token(instance_name: str) -> None:
+    """Forget the cached credential so the next connection mints a new one."""
+    with _CRED_LOCK:
+        _CRED_CACHE.pop(instance_name, None)
+
+
+def _connection_params(instance_name: str) -> tuple[dict[str, Any], datetime]:
+    """Resolve psycopg2 connect kwargs for an instance and the credential's expiry."""
+    # The three lookups are independent, so issue them concurrently and pay
+    # one round-trip of latency instead of three. All are cached, so after
+    # the first call this only hits the network to refresh the credential.
+    # lru_cache doesn't serialise concurrent misses, so resolve the shared
+    # client here first rather than letting all three workers build one.
+    _get_workspace_client()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # Get instance details
+        instance_future = executor.submit(_cached_instance, instance_name)
+
+        # Get (or reuse) credentials
+        cred_future = executor.submit(_get_token, instance_name)
+
+        # Get current user for connection
+        user_future = executor.submit(_cached_username)
+
+        instance = instance_future.result()
+        token, expires_at = cred_future.result()
+        username = user_future.result()
+
+    params = {
+        "host": instance.read_write_dns,
+        "dbname": "databricks_postgres",
+        "user": username,
+        "password": token,
+        "sslmode": "require",
+    }
+    return params, expires_at
+
+
+def _get_pool(instance_name: str) -> ThreadedConnectionPool:
+    """
+    Return the process-wide connection pool for an instance.
+
+    The pool (and its credential) is created on first use and rebuilt
+    once the credential is about to expire or the pool was discarded.
+    """
+    with _POOLS_LOCK:
+        cached = _POOLS.get(instance_name)
+        if cached is not None:
+            pool, expires_at = cached
+            if not pool.closed and expires_at - datetime.now(timezone.utc) > _CREDENTIAL_REFRESH_MARGIN:
+                return pool
+            _POOLS.pop(instance_name)
+            _close_pool(pool)
+
+        params, expires_at = _connection_params(instance_name)
+        pool = ThreadedConnectionPool(_POOL_MIN_CONN, _POOL_MAX_CONN, **params)
+        _POOLS[instance_name] = (pool, expires_at)
+        return pool
+
+
+def _close_pool(pool: ThreadedConnectionPool) -> None:
+    if not pool.closed:
+        try:
+            pool.closeall()
+        except psycopg2.Error:
+            pass
 
-    # Get current user for connection
-    current_user = w.current_user.me()
-    username = current_user.user_name
-
-    # Connect to Lakebase
-    conn = psycopg2.connect(
-        host=instance.read_write_dns,
-        dbname="databricks_postgres",
-        user=username,
-        password=cred.token,
-        sslmode="require"
-    )
 
-    return conn
+def _discard_pool(instance_name: str) -> None:
+    """Drop and close the pool for an instance so the next borrow reconnects."""
+    with _POOLS_LOCK:
+        cached = _POOLS.pop(instance_name, None)
+    if cached is not None:
+        _close_pool(cached[0])
+
+
+@contextmanager
+def borrow_conn(instance_name: str) -> Iterator[Any]:
+    """
+    Borrow a pooled connection to a Lakebase instance.
+
+    The connection is returned to the pool on exit, or closed if it was
+    broken by a connection-level error.
+
+    Example:
+        with borrow_conn("my-lakebase-instance") as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.commit()
+    """
+    pool = _get_pool(instance_name)
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    finally:
+        if pool.closed:
+            # The pool was rebuilt while this connection was borrowed
+            if not conn.closed:
+                conn.close()
+        else:
+            pool.putconn(conn, close=broken or bool(conn.closed))
+
+
+@atexit.register
+def _close_pools() -> None:
+    for instance_name in list(_POOLS):
+        _discard_pool(instance_name)
+
+
+def clip_log_message(text: str, limit: int = MAX_LOG_CHARS) -> str:
+    """
+    Truncate a log payload to at most limit characters, noting how much was cut.
+
+    Args:
+        text: Payload to clip
+        limit: Maximum number of characters to keep (default: MAX_LOG_CHARS)
+
+    Returns:
+        text unchanged if it fits, otherwise its prefix plus a truncation marker.
+    """
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...[truncated {len(text) - limit} chars]"
 
 
 def log_to_lakebase(
     instance_name: str,
     task_name: str,
     message: str,
-    status: str = "completed"
+    status: str = "completed",
+    tool_call_id: Optional[str] = None,
 ) -> None:
     """
     Log a message to Lakebase task_logs table.
 
     This function creates the task_logs table if it doesn't exist
-    and inserts a log entry with the provided information.
+    (once per process) and inserts a log entry with the provided
+    information over a pooled connection reused across calls.
 
     Args:
         instance_name: Name of the Lakebase instance
         task_name: Name of the task for identification
         message: Message to log
         status: Status of the task (default: "completed")
+        tool_call_id: ID of the tool call the row describes, if any
 
     Example:
         log_to_lakebase(
@@ -88,26 +332,203 @@ def log_to_lakebase(
             status="completed"
         )
     """
-    conn = get_lakebase_connection(instance_name)
+    timestamp = datetime.now(timezone.utc)
+    _write_rows(instance_name, [(task_name, message, timestamp, status, tool_call_id)])
 
-    try:
-        # Ensure table exists
-        ensure_task_logs_table_exists(conn)
-
-        # Insert log entry
-        timestamp = datetime.now(timezone.utc)
-
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO task_logs (task_name, message, timestamp, status)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (task_name, message, timestamp, status)
+    print(f"Logged to Lakebase ({instance_name}): task_name={task_name}, message={message}")
+
+
+def _write_rows(instance_name: str, rows: list[tuple[str, str, datetime, str, Optional[str]]]) -> None:
+    """Insert task_logs rows in a single transaction on a pooled connection."""
+    # Retry once on a fresh pool if a connection was dropped server-side or
+    # could not authenticate. The pool is rebuilt from the cached credential;
+    # a new one is only minted when the server rejected the old one.
+    for attempt in range(2):
+        try:
+            with borrow_conn(instance_name) as conn:
+                try:
+                    if instance_name not in _TABLE_READY:
+                        ensure_task_logs_table_exists(conn)
+                        _TABLE_READY.add(instance_name)
+
+                    with conn.cursor() as cur:
+                        if conn not in _PREPARED_CONNS:
+                            cur.execute(_INSERT_STATEMENT_SQL)
+                            _PREPARED_CONNS.add(conn)
+                        # execute_batch sends up to page_size EXECUTEs per round-trip
+                        execute_batch(
+                            cur,
+                            "EXECUTE task_log_ins (%s, %s, %s, %s, %s)",
+                            rows,
+                            page_size=100,
+                        )
+                    conn.commit()
+                except Exception:
+                    # Don't hand a connection back to the pool mid-transaction
+                    if not conn.closed:
+                        conn.rollback()
+                    raise
+            return
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            _discard_pool(instance_name)
+            if _is_auth_error(e):
+                _invalidate_token(instance_name)
+            if attempt:
+                raise
+
+
+class AsyncLakebaseLogger:
+    """
+    Background writer for task_logs rows, so callers never wait on Postgres.
+
+    log() timestamps the row and hands it to a worker thread, which writes
+    rows in batches of up to flush_every, or whatever has arrived within
+    flush_interval seconds of the first pending row. At most one batch is
+    held outside the queue, and the queue is bounded: log() blocks only
+    when maxsize rows are already waiting.
+
+    Connection errors are retried with capped exponential backoff. A batch
+    that hits a row-level error (DataError/IntegrityError, e.g. a value too
+    long for its column) is split so that only the offending rows are
+    dropped; any other failure drops the whole batch. Dropped rows are
+    printed to stdout instead. shutdown() drains the queue and raises the
+    last error if any rows were dropped.
+
+    Example:
+        lakebase_logger = AsyncLakebaseLogger("my-lakebase")
+        lakebase_logger.log("task_1", "step 1", status="tool_call")
+        lakebase_logger.log("task_1", "done")
+        lakebase_logger.shutdown()
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        instance_name: str,
+        flush_every: int = 50,
+        flush_interval: float = 0.2,
+        maxsize: int = 1000,
+        max_retries: int = 4,
+        retry_base: float = 0.5,
+        retry_cap: float = 8.0,
+    ):
+        self.instance_name = instance_name
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.q: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._error: Exception | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="lakebase-logger", daemon=True
+        )
+        self._thread.start()
+
+    def log(
+        self,
+        task_name: str,
+        message: str,
+        status: str = "completed",
+        tool_call_id: Optional[str] = None,
+    ) -> None:
+        """Queue one row for writing."""
+        row = (task_name, message, datetime.now(timezone.utc), status, tool_call_id)
+        try:
+            self.q.put_nowait(row)
+        except queue.Full:
+            # Backpressure rather than dropping rows
+            self.q.put(row)
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """
+        Write everything queued so far and stop the worker thread.
+
+        Raises TimeoutError if the worker is still writing after timeout
+        seconds (any rows it holds are abandoned with the daemon thread).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            # The queue may be full while the worker is stuck on a write
+            self.q.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        self._thread.join(remaining)
+        if self._thread.is_alive():
+            raise TimeoutError(
+                f"Lakebase logger ({self.instance_name}) did not finish writing "
+                f"within {timeout}s"
             )
-        conn.commit()
+        if self._error is not None:
+            raise RuntimeError(
+                f"{self.dropped} task_logs rows could not be written to Lakebase "
+                f"({self.instance_name})"
+            ) from self._error
 
-        print(f"Logged to Lakebase ({instance_name}): task_name={task_name}, message={message}")
+    def _run(self) -> None:
+        batch: list[tuple[str, str, datetime, str, Optional[str]]] = []
+        deadline = 0.0
+        while True:
+            # Block indefinitely while idle; otherwise wait out the batch window
+            wait = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self.q.get(timeout=wait)
+            except queue.Empty:
+                item = None
 
-    finally:
-        conn.close()
+            if item is self._STOP:
+                self._write(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                if len(batch) < self.flush_every and time.monotonic() < deadline:
+                    continue
+            # The batch is settled (written or dropped) before more rows are taken
+            self._write(batch)
+            batch = []
+
+    def _write(self, rows: list) -> None:
+        """Write rows, splitting the batch so a bad row only loses itself."""
+        if not rows:
+            return
+        try:
+            self._write_with_retry(rows)
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            if len(rows) == 1:
+                self._drop(rows, e)
+                return
+            # A row-level error fails the whole transaction; isolate the bad rows
+            for row in rows:
+                self._write([row])
+            return
+        except Exception as e:
+            # Connection errors were already retried; anything else (SDK errors
+            # while building the pool, permissions, ...) isn't specific to a row
+            self._drop(rows, e)
+            return
+        print(f"Logged {len(rows)} rows to Lakebase ({self.instance_name})")
+
+    def _write_with_retry(self, rows: list) -> None:
+        """Write rows, retrying connection errors with capped exponential backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                _write_rows(self.instance_name, rows)
+                return
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.retry_cap, self.retry_base * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _drop(self, rows: list, error: Exception) -> None:
+        """Give up on rows, printing them so they still end up in the job output."""
+        self.dropped += len(rows)
+        self._error = error
+        print(f"Failed to log {len(rows)} rows to Lakebase ({self.instance_name}): {error}")
+        for task_name, message, timestamp, status, tool_call_id in rows:
+            print(f"  [{timestamp.isoformat()}] {task_name} {status} {tool_call_id or ''}: {message}")
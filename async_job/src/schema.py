@@ -12,18 +12,73 @@ CREATE TABLE IF NOT EXISTS task_logs (
     task_name VARCHAR(255) NOT NULL,
     message TEXT NOT NULL,
     timestamp TIMESTAMPTZ NOT NULL,
-    status VARCHAR(50) NOT NULL
+    status VARCHAR(50) NOT NULL,
+    tool_call_id VARCHAR(64)
 )
 """
 
+# Columns added after the initial schema, for tables created before them;
+# column name -> DDL
+TASK_LOGS_MIGRATIONS = {
+    "tool_call_id": "ALTER TABLE task_logs ADD COLUMN IF NOT EXISTS tool_call_id VARCHAR(64)",
+}
+
+# Indexes for the common read paths: a task's logs in time order, and
+# filtering by status. Kept separate from the CREATE TABLE so existing
+# tables pick them up too; index name -> DDL.
+TASK_LOGS_INDEXES = {
+    "task_logs_task_time_idx": (
+        "CREATE INDEX IF NOT EXISTS task_logs_task_time_idx "
+        "ON task_logs (task_name, timestamp DESC)"
+    ),
+    "task_logs_status_idx": "CREATE INDEX IF NOT EXISTS task_logs_status_idx ON task_logs (status)",
+    "task_logs_tool_call_id_idx": (
+        "CREATE INDEX IF NOT EXISTS task_logs_tool_call_id_idx ON task_logs (tool_call_id)"
+    ),
+}
+
+# What already exists: the table, its columns and its indexes. ALTER TABLE
+# and CREATE INDEX lock the table before their IF NOT EXISTS check, so they
+# are only issued for what is actually missing.
+_TASK_LOGS_STATE_SQL = """
+SELECT
+    to_regclass('task_logs') IS NOT NULL,
+    ARRAY(
+        SELECT column_name::text FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'task_logs'
+    ),
+    ARRAY(
+        SELECT indexname::text FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = 'task_logs'
+    )
+"""
+
 
 def ensure_task_logs_table_exists(conn) -> None:
     """
-    Create the task_logs table if it doesn't exist.
+    Create the task_logs table, missing columns and indexes if needed.
+
+    Reads the catalog first and only runs DDL for what is missing, so the
+    common case (everything in place) takes no lock on task_logs.
 
     Args:
         conn: psycopg2 connection object
     """
     with conn.cursor() as cur:
-        cur.execute(TASK_LOGS_SCHEMA)
+        cur.execute(_TASK_LOGS_STATE_SQL)
+        table_exists, columns, indexes = cur.fetchone()
+
+        statements = []
+        if not table_exists:
+            statements.append(TASK_LOGS_SCHEMA)
+        else:
+            statements.extend(
+                ddl for column, ddl in TASK_LOGS_MIGRATIONS.items() if column not in columns
+            )
+        statements.extend(
+            ddl for name, ddl in TASK_LOGS_INDEXES.items() if name not in indexes
+        )
+
+        for statement in statements:
+            cur.execute(statement)
     conn.commit()
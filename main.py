@@ -4,19 +4,54 @@ Main entry point for running the LangGraph supervisor agent locally.
 Sets up Databricks environment variables and runs the agent with an example input.
 """
 
-from dotenv import load_dotenv
+import argparse
+import sys
 
-# Load environment variables from .env file if present
-load_dotenv()
 
-from agent.config_loader import get_mlflow_experiment_id
-from agent.utils import check_databricks_environment, setup_mlflow_tracking
+def _write_block(*lines: object) -> None:
+    """Write a block of output lines with a single write call."""
+    sys.stdout.write("\n".join(map(str, lines)) + "\n")
+    sys.stdout.flush()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the supervisor agent locally")
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Validate the environment and config.yaml, print the resolved settings and exit",
+    )
+    args = parser.parse_args()
+
+    # Deferred to call time so importing this module (or --help) stays cheap
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file if present
+    load_dotenv()
+
+    from agent.config_loader import (
+        get_databricks_job_id,
+        get_lakebase_instance_name,
+        get_llm_endpoint_name,
+        get_mlflow_experiment_id,
+    )
+    from agent.utils import check_databricks_environment, setup_mlflow_tracking
+
     if not check_databricks_environment():
         return
 
+    if args.dry_run:
+        # Reading every setting validates config.yaml without touching Databricks
+        _write_block(
+            "=" * 60,
+            "Dry run: resolved settings",
+            "=" * 60,
+            f"MLflow experiment:  {get_mlflow_experiment_id()}",
+            f"LLM endpoint:       {get_llm_endpoint_name()}",
+            f"Databricks job ID:  {get_databricks_job_id()}",
+            f"Lakebase instance:  {get_lakebase_instance_name()}",
+        )
+        return
+
     # Configure MLflow to use Databricks tracking service
     setup_mlflow_tracking(get_mlflow_experiment_id())
 
@@ -38,14 +73,10 @@ def main():
         "custom_inputs": {"ica_id": "AA1", "client_id": "client_a"},
     }
 
-    print("=" * 60)
-    print("Running LangGraph Supervisor Agent")
-    print("=" * 60)
+    _write_block("=" * 60, "Running LangGraph Supervisor Agent", "=" * 60)
 
     response = AGENT.predict(example_input)
-    print("-" * 60)
-    print(response)
-    print("-" * 60)
+    _write_block("-" * 60, response, "-" * 60)
 
     thread_id = response.custom_outputs["thread_id"]
 
@@ -59,12 +90,13 @@ def main():
     }
 
     follow_up_response = AGENT.predict(example_input_2)
-    print("-" * 60)
-    print(follow_up_response)
-    print("-" * 60)
-
-    print("*" * 60)
-    print("Agent execution complete.")
+    _write_block(
+        "-" * 60,
+        follow_up_response,
+        "-" * 60,
+        "*" * 60,
+        "Agent execution complete.",
+    )
 
 
 if __name__ == "__main__":
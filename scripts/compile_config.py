@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Precompile agent/config.yaml into agent/_config_compiled.py.
+
+The generated module holds the parsed config as a Python literal so that
+packaged deployments (e.g. Model Serving, where config.yaml is immutable)
+skip YAML parsing at import time. The module records the SHA-256 of the
+config.yaml it was built from; agent.config_loader only uses it while that
+still matches (or when config.yaml is missing), so a stale compile falls
+back to parsing the YAML. Re-run this script after editing config.yaml.
+"""
+
+import hashlib
+import pprint
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+AGENT_DIR = Path(__file__).resolve().parent.parent / "agent"
+CONFIG_PATH = AGENT_DIR / "config.yaml"
+OUTPUT_PATH = AGENT_DIR / "_config_compiled.py"
+
+
+def main():
+    data = CONFIG_PATH.read_bytes()
+    config = yaml.load(data, Loader=_YamlLoader)
+
+    OUTPUT_PATH.write_text(
+        '"""Generated by scripts/compile_config.py from config.yaml; do not edit."""\n\n'
+        f"SOURCE_SHA256 = {hashlib.sha256(data).hexdigest()!r}\n\n"
+        f"CONFIG = {pprint.pformat(config, sort_dicts=False)}\n"
+    )
+    print(f"Wrote {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()